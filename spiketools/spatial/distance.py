@@ -1,9 +1,11 @@
 """Distance related functions."""
 
+import math
+
 import numpy as np
 
 from spiketools.utils.checks import check_array_orientation
-from spiketools.utils.data import make_orientation
+from spiketools.spatial.utils import get_position_xy
 
 ###################################################################################################
 ###################################################################################################
@@ -13,7 +15,7 @@ def compute_distance(p1, p2):
 
     Parameters
     ----------
-    p1, p2 : list of float
+    p1, p2 : float or list of float
         The position values of the two positions to calculate distance between.
         Can be 1d (a single value per position) or 2d (x and y values per position).
 
@@ -38,16 +40,30 @@ def compute_distance(p1, p2):
     5.0
     """
 
-    return np.linalg.norm(np.array(p1) - np.array(p2))
+    # For 1d & 2d positions, compute directly on the values, avoiding array creation
+    if np.ndim(p1) == 0:
+        distance = float(abs(p1 - p2))
+    elif len(p1) == 1:
+        distance = float(abs(p1[0] - p2[0]))
+    elif len(p1) == 2:
+        distance = math.hypot(p1[0] - p2[0], p1[1] - p2[1])
+    else:
+        diff = np.subtract(p1, p2)
+        distance = float(np.sqrt(diff @ diff))
+
+    return distance
 
 
-def compute_distances(position):
+def compute_distances(position, dtype=float):
     """Compute distances across a sequence of positions.
 
     Parameters
     ----------
     position : 1d or 2d array
         Position values.
+    dtype : str or type, optional, default: float
+        Data type to cast the positions to, in which distances are computed and returned.
+        By default, any other input type, including float32, is cast to float64.
 
     Returns
     -------
@@ -70,11 +86,66 @@ def compute_distances(position):
     array([1.        , 1.        , 1.41421356])
     """
 
-    position = make_orientation(position, 'column')
+    steps = [np.diff(values) for values in _get_position_axes(position, dtype)]
+    distances = _compute_norm(steps)
+
+    return distances
 
-    distances = np.zeros(len(position) - 1)
-    for ix, (p1, p2) in enumerate(zip(position, position[1:])):
-        distances[ix] = compute_distance(p1, p2)
+
+def compute_trial_distances(trial_position, dtype=float):
+    """Compute distances across sequences of positions, for a set of trials.
+
+    Parameters
+    ----------
+    trial_position : 2d or 3d array
+        Position values per trial, with the same number of samples in each trial.
+        If 2d, should be 1d position values, organized as [n_trials, n_samples].
+        If 3d, should be 2d position values, organized as [n_trials, 2, n_samples],
+        or as [n_trials, n_samples, 2].
+    dtype : str or type, optional, default: float
+        Data type to cast the trial positions to, in which distances are computed and returned.
+
+    Returns
+    -------
+    distances : 2d array
+        Distances between positions, per trial, with shape [n_trials, n_samples - 1].
+
+    Raises
+    ------
+    ValueError
+        If 3d trial position input does not have a position axis of length 2.
+
+    Notes
+    -----
+    This computes distances across all trials together, which is equivalent to, but avoids
+    the overhead of, calling `compute_distances` separately for each trial.
+
+    Examples
+    --------
+    Compute distances across sequences of 2d positions, for two trials:
+
+    >>> trial_position = np.array([[[1, 2, 2, 3], [1, 1, 2, 3]],
+    ...                            [[0, 0, 3, 3], [0, 4, 4, 4]]])
+    >>> compute_trial_distances(trial_position)
+    array([[1.        , 1.        , 1.41421356],
+           [4.        , 3.        , 0.        ]])
+    """
+
+    assert trial_position.ndim in (2, 3), 'Trial position input should be 2d or 3d.'
+
+    if trial_position.ndim == 2:
+        axes = (trial_position,)
+    else:
+        orientation = check_array_orientation(trial_position, 2)
+        if orientation == 'row' and trial_position.shape[1] == 2:
+            axes = (trial_position[:, 0, :], trial_position[:, 1, :])
+        elif orientation == 'column' and trial_position.shape[2] == 2:
+            axes = (trial_position[:, :, 0], trial_position[:, :, 1])
+        else:
+            raise ValueError('3d trial position input should have a position axis of length 2.')
+
+    steps = [np.diff(np.ascontiguousarray(values, dtype=dtype), axis=-1) for values in axes]
+    distances = _compute_norm(steps)
 
     return distances
 
@@ -119,7 +190,7 @@ def compute_cumulative_distances(position, align_output=True):
     return cumul_dists
 
 
-def compute_distances_to_location(position, location):
+def compute_distances_to_location(position, location, dtype=float):
     """Compute distances between a sequence of positions and a specified location.
 
     Parameters
@@ -129,6 +200,8 @@ def compute_distances_to_location(position, location):
     location : list of float
         The position values of the two positions to calculate distance between.
         Can be 1d (a single value per position) or 2d (x and y values per position).
+    dtype : str or type, optional, default: float
+        Data type to cast the positions and location to, for computing and returning distances.
 
     Returns
     -------
@@ -153,11 +226,12 @@ def compute_distances_to_location(position, location):
     array([1.41421356, 1.        , 0.        , 1.41421356])
     """
 
-    position = make_orientation(position, 'column')
+    axes = _get_position_axes(position, dtype)
+    location = np.atleast_1d(np.asarray(location, dtype=dtype))
+    assert len(location) == len(axes), 'Location should match the dimensions of the position.'
 
-    distances = np.zeros(len(position))
-    for ix, pos in enumerate(position):
-        distances[ix] = compute_distance(pos, location)
+    offsets = [values - loc for values, loc in zip(axes, location)]
+    distances = _compute_norm(offsets)
 
     return distances
 
@@ -213,3 +287,54 @@ def get_closest_position(position, location, threshold=None):
             min_ind = -1
 
     return min_ind
+
+
+def _get_position_axes(position, dtype=float):
+    """Get position values as a separate, contiguous, vector per axis.
+
+    Parameters
+    ----------
+    position : 1d or 2d array
+        Position values.
+    dtype : str or type, optional, default: float
+        Data type for the returned position values.
+
+    Returns
+    -------
+    tuple of 1d array
+        Position values, with one vector per spatial dimension.
+
+    Notes
+    -----
+    For 2d row-oriented position data already of the requested type, the returned vectors
+    are views of the input, such that no transposed copy of the position data is needed.
+    """
+
+    axes = (position,) if position.ndim == 1 else get_position_xy(position)
+
+    return tuple(np.ascontiguousarray(values, dtype=dtype) for values in axes)
+
+
+def _compute_norm(diffs):
+    """Compute the euclidean norm, across spatial dimensions, of per-axis differences.
+
+    Parameters
+    ----------
+    diffs : list of array
+        Differences in position values, with one float array per spatial dimension.
+
+    Returns
+    -------
+    norm : array
+        Euclidean norm of the differences.
+    """
+
+    if len(diffs) == 1:
+        norm = np.abs(diffs[0])
+    else:
+        norm = np.square(diffs[0])
+        for diff in diffs[1:]:
+            norm += np.square(diff)
+        np.sqrt(norm, out=norm)
+
+    return norm
@@ -1,13 +1,22 @@
 """Measures of spatial information."""
 
+import math
+
 import numpy as np
 
-from spiketools.spatial.occupancy import normalize_bin_counts
+from spiketools.modutils.dependencies import safe_import
+
+nb = safe_import('numba')
+ne = safe_import('numexpr')
+prange = nb.prange if nb else range
 
 ###################################################################################################
 ###################################################################################################
 
-def compute_spatial_information(bin_firing, occupancy, normalize=False):
+# Number of bins from which spatial information is computed in parallel, if possible
+PARALLEL_NBINS = 100000
+
+def compute_spatial_information(bin_firing, occupancy, normalize=False, dtype=float):
     """Compute spatial information.
 
     Parameters
@@ -17,13 +26,16 @@ def compute_spatial_information(bin_firing, occupancy, normalize=False):
     occupancy : 1d or 2d array
         Occupancy across the space.
     normalize : bool, optional, default: False
-        If True, normalize the binned firing rate data by the occupancy.
+        If True, the binned firing is taken as spike counts, to be normalized by the occupancy.
         If False, it is assumed that the binned firing has already been normalized.
+    dtype : str or type, optional, default: float
+        Data type to cast the binned firing and occupancy to, for computing spatial information.
 
     Returns
     -------
     info : float
         Spike information rate for spatial information (bits/spike).
+        Is 0 if there is no firing in occupied bins, and NaN if there is no occupancy.
 
     Notes
     -----
@@ -33,6 +45,16 @@ def compute_spatial_information(bin_firing, occupancy, normalize=False):
 
         I = \\sum{\\lambda (x) log_2 \\frac{\\lambda(x)} {\\lambda} p(x)dx}
 
+    This is computed from the spike counts per bin, :math:`s(x)`, and occupancy, :math:`o(x)`,
+    which avoids dividing by occupancy to compute firing rates, using the equivalent form:
+
+    .. math::
+
+        I = \\frac{1}{S} \\sum{s(x) log_2 \\frac{s(x) O} {o(x) S}}
+
+    where :math:`S` is the total number of spikes in occupied bins and :math:`O` is the
+    total occupancy.
+
     References
     ----------
     .. [1] Skaggs, W. E., McNaughton, B. L., & Gothard, K. M. (1992). An
@@ -60,22 +82,112 @@ def compute_spatial_information(bin_firing, occupancy, normalize=False):
     0.4512
     """
 
-    if normalize:
-        bin_firing = normalize_bin_counts(bin_firing, occupancy)
+    bin_firing = np.ascontiguousarray(bin_firing, dtype=dtype)
+    occupancy = np.ascontiguousarray(occupancy, dtype=dtype)
 
-    # Calculate average firing rate of the neuron, dividing out by total occupancy time
-    #   Note: this recomputes total spike (basically, de-normalizing)
-    rate = np.nansum(bin_firing * occupancy) / np.nansum(occupancy)
+    # Get the spike counts per bin, de-normalizing the binned firing if needed
+    bin_counts = bin_firing if normalize else bin_firing * occupancy
 
-    # Catch for a neuron with no firing - return 0 information
-    if rate == 0.0:
-        return 0.0
+    # If numba is available, compute with a compiled kernel that makes a single pass
+    #   For large numbers of bins, the parallel version of the kernel is used
+    if nb:
+        kernel = _spatial_information_kernel if bin_counts.size < PARALLEL_NBINS \
+            else _spatial_information_kernel_parallel
+        info = kernel(bin_counts.ravel(), occupancy.ravel())
 
-    # Compute the occupancy probability, per bin
-    occ_prob = occupancy / np.nansum(occupancy)
+    else:
 
-    # Calculate the spatial information, using a mask for nonzero values
-    nz = np.nonzero(bin_firing)
-    info = np.nansum(occ_prob[nz] * bin_firing[nz] * np.log2(bin_firing[nz] / rate)) / rate
+        # Compute total occupancy time, and total number of spikes within occupied bins
+        occupied = occupancy > 0
+        occ_total = np.nansum(occupancy)
+        spike_total = np.nansum(bin_counts[occupied])
+
+        # Catch for no occupancy - return NaN, as the average firing rate is undefined
+        if occ_total == 0:
+            return np.nan
+
+        # Catch for a neuron with no firing - return 0 information
+        if spike_total == 0:
+            return 0.0
+
+        # Precompute the ratio of totals, used to scale the count / occupancy ratio per bin
+        scale = occ_total / spike_total
+
+        # If numexpr is available to run in parallel, evaluate as a single, threaded expression
+        if ne and ne.get_num_threads() > 1 and bin_counts.size >= PARALLEL_NBINS:
+            expr = 'where((counts > 0) & (occ > 0), counts * log(counts * scale / occ), 0)'
+            terms = ne.evaluate(expr, local_dict={'counts' : bin_counts, 'occ' : occupancy,
+                                                  'scale' : scale})
+            info = np.sum(terms) / (np.log(2) * spike_total)
+
+        # Otherwise, calculate the spatial information, masking to bins with spikes & occupancy
+        else:
+            mask = bin_counts > 0
+            mask &= occupied
+            counts = bin_counts[mask]
+
+            # Compute the per-bin terms in place, in a single buffer
+            terms = counts * scale
+            terms /= occupancy[mask]
+            np.log2(terms, out=terms)
+            terms *= counts
+            info = np.sum(terms) / spike_total
+
+        info = float(info)
 
     return info
+
+
+def _spatial_information_kernel(bin_counts, occupancy):
+    """Compute spatial information, looping across bins without creating intermediate arrays.
+
+    Parameters
+    ----------
+    bin_counts : 1d array
+        Spike counts per bin, flattened across all bins, as float32 or float64.
+    occupancy : 1d array
+        Occupancy across the space, flattened across all bins, as float32 or float64.
+
+    Returns
+    -------
+    info : float
+        Spike information rate for spatial information (bits/spike).
+        Is 0 if there is no firing in occupied bins, and NaN if there is no occupancy.
+
+    Notes
+    -----
+    This function is compiled with numba, if available, as both a serial and a parallel version.
+    In the parallel version, the loops across bins are split across threads.
+    Bins with NaN values are skipped, matching the `nansum` approach of the array computation.
+    """
+
+    # Accumulate total occupancy, and total spikes within occupied bins
+    spike_total = 0.
+    occ_total = 0.
+    for ind in prange(bin_counts.size):
+        if not math.isnan(occupancy[ind]):
+            occ_total += occupancy[ind]
+        if occupancy[ind] > 0 and not math.isnan(bin_counts[ind]):
+            spike_total += bin_counts[ind]
+
+    if occ_total == 0.0:
+        return math.nan
+    if spike_total == 0.0:
+        return 0.0
+    scale = occ_total / spike_total
+
+    # Accumulate information, only from bins with spikes and occupancy
+    info = 0.
+    for ind in prange(bin_counts.size):
+        if bin_counts[ind] > 0 and occupancy[ind] > 0:
+            info += bin_counts[ind] * math.log2(bin_counts[ind] * scale / occupancy[ind])
+
+    return info / spike_total
+
+
+# Compile the serial and parallel kernels from the same function
+#   Note: only the serial kernel is cached, as the numba cache entry is named by the function,
+#   and does not account for `parallel`, such that each version could load the other from cache
+if nb:
+    _spatial_information_kernel_parallel = nb.njit(parallel=True)(_spatial_information_kernel)
+    _spatial_information_kernel = nb.njit(cache=True)(_spatial_information_kernel)
@@ -1,7 +1,5 @@
 """Spatial position and occupancy related functions."""
 
-import warnings
-
 import numpy as np
 import pandas as pd
 
@@ -258,9 +256,15 @@ def compute_bin_counts_assgn(bins, xbins, ybins=None, occupancy=None):
         bins = np.arange(0, bins[0] + 1)
         bin_counts, _ = np.histogram(xbins, bins=bins)
     else:
-        bins = [np.arange(0, bins[0] + 1), np.arange(0, bins[1] + 1)]
-        bin_counts, _, _ = np.histogram2d(xbins, ybins, bins=bins)
-        bin_counts = bin_counts.T
+
+        # Count across linearized [y, x] bin indices, dropping assignments outside of the bins
+        #   Note: as with histogram edges, assignments equal to n_bins are counted in the last bin
+        xbins, ybins = np.asarray(xbins), np.asarray(ybins)
+        valid = (xbins >= 0) & (xbins <= bins[0]) & (ybins >= 0) & (ybins <= bins[1])
+        x_inds = np.minimum(xbins[valid], bins[0] - 1).astype(int)
+        y_inds = np.minimum(ybins[valid], bins[1] - 1).astype(int)
+        bin_counts = np.bincount(y_inds * bins[0] + x_inds, minlength=bins[0] * bins[1])
+        bin_counts = bin_counts.reshape(bins[1], bins[0]).astype(float)
 
     if occupancy is not None:
         bin_counts = normalize_bin_counts(bin_counts, occupancy)
@@ -298,8 +302,7 @@ def normalize_bin_counts(bin_counts, occupancy):
            [1. , 2. , nan]])
     """
 
-    with warnings.catch_warnings():
-        warnings.simplefilter('ignore', category=RuntimeWarning)
+    with np.errstate(divide='ignore', invalid='ignore'):
         normalized_bin_counts = bin_counts / occupancy
 
     return normalized_bin_counts
@@ -1,9 +1,12 @@
 """ANOVA related helper functions."""
 
+import re
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 
-from spiketools.utils.base import flatten
 from spiketools.utils.checks import check_param_options
 from spiketools.modutils.dependencies import safe_import, check_dependency
 
@@ -13,6 +16,10 @@ smf = safe_import('.formula.api', 'statsmodels')
 ###################################################################################################
 ###################################################################################################
 
+# Cache of design matrices for model fitting, and the maximum number of entries to keep
+DESIGN_CACHE = OrderedDict()
+DESIGN_CACHE_SIZE = 16
+
 def create_dataframe(data, columns=None, dropna=True, dtypes=None):
     """Create a dataframe from an array of data.
 
@@ -46,7 +53,8 @@ def create_dataframe(data, columns=None, dropna=True, dtypes=None):
 
     df = pd.DataFrame(data, columns=columns)
 
-    if dropna:
+    # Check for NaN values before dropping, as `dropna` always copies the dataframe
+    if dropna and df.isna().values.any():
         df = df.dropna()
 
     if dtypes:
@@ -81,6 +89,7 @@ def create_dataframe_bins(bin_data, other_data=None, dropna=True, dtypes=None, b
     -------
     df : pd.DataFrame
         Constructed dataframe.
+        Columns are ordered as trial, bin labels, any additional data, and then the bin data.
 
     Examples
     --------
@@ -94,40 +103,40 @@ def create_dataframe_bins(bin_data, other_data=None, dropna=True, dtypes=None, b
 
         n_trials, n_bins = bin_data.shape
 
-        trial = np.repeat(np.arange(0, n_trials), n_bins)
-        labels = np.tile(np.arange(0, n_bins), n_trials)
+        trial, labels = np.indices(bin_data.shape).reshape(2, -1)
 
         bin_columns = ['bin', 'fr'] if not bin_columns else bin_columns
         df_data = {'trial' : trial,
                    bin_columns[0] : labels,
-                   bin_columns[1] : bin_data.flatten()}
+                   bin_columns[1] : bin_data.ravel()}
 
     elif bin_data.ndim == 3:
 
         n_trials, n_xbins, n_ybins = bin_data.shape
         n_bins = n_xbins * n_ybins
 
-        trial = np.repeat(np.arange(0, n_trials), n_xbins * n_ybins)
-        xlabels = np.tile(np.repeat(np.arange(0, n_xbins), n_ybins), n_trials)
-        ylabels = np.tile(np.arange(0, n_ybins), n_trials * n_xbins)
+        trial, xlabels, ylabels = np.indices(bin_data.shape).reshape(3, -1)
 
         bin_columns = ['xbin', 'ybin', 'fr'] if not bin_columns else bin_columns
         df_data = {'trial' : trial,
                    bin_columns[0] : xlabels,
                    bin_columns[1] : ylabels,
-                   bin_columns[2] : bin_data.flatten()}
+                   bin_columns[2] : bin_data.ravel()}
 
     if other_data is not None:
         for label, data in other_data.items():
             df_data[label] = np.repeat(data, n_bins)
 
-    dtype_defaults = {col : 'int' for col in df_data.keys() if col == 'trial' or 'bin' in col}
+    # Typecast label columns to int, skipping any that are already integer (such as bin labels)
+    dtype_defaults = {col : 'int' for col, values in df_data.items() \
+        if (col == 'trial' or 'bin' in col) and not np.issubdtype(values.dtype, np.integer)}
     dtypes = {**dtypes, **dtype_defaults} if dtypes is not None else dtype_defaults
 
     df = create_dataframe(df_data, dropna=dropna, dtypes=dtypes)
 
-    # Reorder dataframe so that `trial` column is first and `fr` is at the end & sorted in between
-    df = df[flatten([['trial'], sorted(list(set(df.columns) - set(['trial', 'fr']))), ['fr']])]
+    # Reorder dataframe so that `trial` column is first and the binned data column is at the end
+    df = df[['trial'] + [col for col in df.columns if col not in ('trial', bin_columns[-1])] + \
+            [bin_columns[-1]]]
 
     return df
 
@@ -176,7 +185,7 @@ def fit_anova(df, formula, feature=None, return_type='f_val', anova_type=2):
 
     check_param_options(return_type, 'return_type', ['model', 'results', 'f_val'])
 
-    model = smf.ols(formula, data=df).fit()
+    model = _fit_ols(df, formula)
 
     if return_type == 'model':
         output = model
@@ -192,3 +201,62 @@ def fit_anova(df, formula, feature=None, return_type='f_val', anova_type=2):
             output = results['F'][feature]
 
     return output
+
+
+def _fit_ols(df, formula):
+    """Fit an OLS model, reusing design matrices across fits with the same predictor data.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe of data to fit the model to.
+    formula : str
+        The formula.
+
+    Returns
+    -------
+    model : statsmodels.regression.linear_model.RegressionResults
+        The fit model.
+
+    Notes
+    -----
+    Building the design matrix from the formula typically takes longer than fitting the model.
+    When fitting the same formula with the same predictor data, for example across units with
+    the same binning, the design matrix is therefore cached, keyed by the formula, column
+    labels & types, and a hash of the predictor data. The cache is only used if the outcome
+    is a column of the dataframe that is not also used in the predictor terms of the formula,
+    and the data has no missing values.
+    """
+
+    outcome, terms = [part.strip() for part in formula.split('~', 1)]
+    if outcome not in df.columns or re.search(r'\b{}\b'.format(re.escape(outcome)), terms) \
+        or df.isna().values.any():
+        return smf.ols(formula, data=df).fit()
+
+    predictors = df.drop(columns=outcome)
+    key = (formula, tuple(df.columns), tuple(df.dtypes.astype(str)),
+           hashlib.sha1(pd.util.hash_pandas_object(predictors).values).digest())
+
+    if key in DESIGN_CACHE:
+
+        DESIGN_CACHE.move_to_end(key)
+        exog, spec = DESIGN_CACHE[key]
+
+        # Initialize the model from the cached design, matching the attributes of a formula model
+        model = sm.OLS(df[outcome], exog, formula=formula, **spec)
+        model.formula = formula
+        model.data.frame = df
+        model = model.fit()
+
+    else:
+
+        model = smf.ols(formula, data=df).fit()
+
+        # Store the design matrix, and its specification, as named by the statsmodels version
+        spec = {label : getattr(model.model.data, label) for label in \
+            ['model_spec', 'design_info'] if hasattr(model.model.data, label)}
+        DESIGN_CACHE[key] = (model.model.data.orig_exog, spec)
+        if len(DESIGN_CACHE) > DESIGN_CACHE_SIZE:
+            DESIGN_CACHE.popitem(last=False)
+
+    return model
@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from pytest import raises
+
 from spiketools.spatial.distance import *
 
 ###################################################################################################
@@ -9,6 +11,15 @@ from spiketools.spatial.distance import *
 
 def test_compute_distance():
 
+    # 1d, as scalars
+    out1ds0 = compute_distance(1, 3)
+    assert isinstance(out1ds0, float)
+    assert np.isclose(out1ds0, 2.0)
+
+    out1ds1 = compute_distance(np.float64(2.5), np.int64(1))
+    assert isinstance(out1ds1, float)
+    assert np.isclose(out1ds1, 1.5)
+
     # 1d
     out1d0 = compute_distance([1], [1])
     assert isinstance(out1d0, float)
@@ -33,6 +44,11 @@ def test_compute_distance():
     out2d3 = compute_distance([1, 1], [-1, 1])
     assert np.isclose(out2d3, 2)
 
+    # 3d
+    out3d = compute_distance([1, 2, 3], [1, 4, 3])
+    assert isinstance(out3d, float)
+    assert np.isclose(out3d, 2)
+
 def test_compute_distances():
 
     # 1d
@@ -50,6 +66,43 @@ def test_compute_distances():
     assert len(out2d) == pos2d.shape[-1] - 1
     assert np.allclose(out2d, np.array([0, 1, 1, np.sqrt(2)]))
 
+    # 2d, with float32 data
+    out2d32 = compute_distances(pos2d.astype('float32'))
+    assert isinstance(out2d32, np.ndarray)
+    assert np.allclose(out2d32, np.array([0, 1, 1, np.sqrt(2)]))
+
+    # 2d, computing as float32
+    out2d32 = compute_distances(pos2d, dtype='float32')
+    assert out2d32.dtype == 'float32'
+    assert np.allclose(out2d32, np.array([0, 1, 1, np.sqrt(2)]))
+
+def test_compute_trial_distances():
+
+    # 1d
+    pos1d = np.array([[0, 0, 1, 1, 2],
+                      [0, 2, 2, 1, 1]])
+    out1d = compute_trial_distances(pos1d)
+    assert isinstance(out1d, np.ndarray)
+    assert out1d.shape == (2, 4)
+    for trial_pos, trial_out in zip(pos1d, out1d):
+        assert np.allclose(trial_out, compute_distances(trial_pos))
+
+    # 2d, with row and column orientation
+    pos2d = np.array([[[0, 0, 1, 1, 2], [0, 0, 0, 1, 2]],
+                      [[1, 2, 2, 4, 4], [3, 1, 1, 0, 2]],
+                      [[0, 1, 2, 3, 4], [0, 1, 2, 3, 4]]])
+    out2d = compute_trial_distances(pos2d)
+    assert isinstance(out2d, np.ndarray)
+    assert out2d.shape == (3, 4)
+    for trial_pos, trial_out in zip(pos2d, out2d):
+        assert np.allclose(trial_out, compute_distances(trial_pos))
+    assert np.allclose(compute_trial_distances(pos2d.transpose(0, 2, 1)), out2d)
+
+    # check error with 3d input that has no position axis of length 2
+    for shape in [(2, 50, 3), (3, 50, 4)]:
+        with raises(ValueError):
+            compute_trial_distances(np.zeros(shape))
+
 def test_compute_cumulative_distances():
 
     # 1d
@@ -92,6 +145,22 @@ def test_compute_distances_to_location():
     assert len(out2d) == pos2d.shape[-1]
     assert np.allclose(out2d, np.array([1, 1, 0, 1, np.sqrt(5)]))
 
+    # 2d, with float32 data
+    out2d32 = compute_distances_to_location(pos2d.astype('float32'), loc2d)
+    assert isinstance(out2d32, np.ndarray)
+    assert np.allclose(out2d32, np.array([1, 1, 0, 1, np.sqrt(5)]))
+
+    # 2d, computing as float32
+    out2d32 = compute_distances_to_location(pos2d, loc2d, dtype='float32')
+    assert out2d32.dtype == 'float32'
+    assert np.allclose(out2d32, np.array([1, 1, 0, 1, np.sqrt(5)]))
+
+    # check error with mismatched position & location dimensions
+    with raises(AssertionError):
+        compute_distances_to_location(pos2d, [3.])
+    with raises(AssertionError):
+        compute_distances_to_location(pos1d, [2, 2])
+
 def test_get_closest_location():
 
     # 1d
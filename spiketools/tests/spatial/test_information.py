@@ -1,11 +1,21 @@
 """Tests for spiketools.spatial.information"""
 
+import pytest
+
+import spiketools.spatial.information as information
 from spiketools.spatial.information import *
+from spiketools.spatial.information import _spatial_information_kernel
+from spiketools.spatial.occupancy import normalize_bin_counts
 
 ###################################################################################################
 ###################################################################################################
 
-def test_compute_spatial_information():
+@pytest.mark.parametrize('use_numba', [True, False])
+def test_compute_spatial_information(monkeypatch, use_numba):
+
+    # Check both the numba kernel and the numpy computation (used if numba is not available)
+    if not use_numba:
+        monkeypatch.setattr(information, 'nb', False)
 
     # 1d case: set baseline test values, with no spatial info
     occupancy = np.array([1, 1, 1, 1, 1])
@@ -28,6 +38,17 @@ def test_compute_spatial_information():
     assert isinstance(spatial_info3, float)
     assert np.isclose(spatial_info3, spatial_info2)
 
+    # 1d case - check computing as float32
+    spatial_info4 = compute_spatial_information(binned_firing_new, occupancy, dtype='float32')
+    assert isinstance(spatial_info4, float)
+    assert np.isclose(spatial_info4, spatial_info2)
+
+    # 1d case - check with enough bins to use parallel computation
+    n_bins = PARALLEL_NBINS + 1
+    spatial_info5 = compute_spatial_information(np.arange(n_bins), np.ones(n_bins))
+    assert isinstance(spatial_info5, float)
+    assert spatial_info5 > 0.
+
     # 2d case: set baseline test values, with no spatial info
     occupancy = np.array([[1, 1, 1, 1], [1, 1, 1, 1]])
     binned_firing = np.array([[1, 1, 1, 1], [1, 1, 1, 1]])
@@ -48,3 +69,84 @@ def test_compute_spatial_information():
     spatial_info3 = compute_spatial_information(binned_firing_new, occupancy_new)
     assert isinstance(spatial_info3, float)
     assert np.isclose(spatial_info3, spatial_info2)
+
+    # 2d case - check with unvisited (NaN) bins, and zero occupancy bins that contain spikes
+    occupancy = np.array([[1., 2., 0., 1.], [1., np.nan, 1., 1.]])
+    bin_counts = np.array([[1., 1., 3., 4.], [1., 2., 0., 3.]])
+    bin_firing = normalize_bin_counts(bin_counts, occupancy)
+
+    # Compute the expected value from normalized firing, ignoring invalid (unoccupied) bins
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.nansum(bin_firing * occupancy) / np.nansum(occupancy)
+        occ_prob = occupancy / np.nansum(occupancy)
+        nz = np.nonzero(bin_firing)
+        expected = np.nansum(occ_prob[nz] * bin_firing[nz] *
+            np.log2(bin_firing[nz] / rate)) / rate
+
+        spatial_info4 = compute_spatial_information(bin_firing, occupancy)
+    assert isinstance(spatial_info4, float)
+    assert np.isclose(spatial_info4, expected)
+
+    spatial_info5 = compute_spatial_information(bin_counts, occupancy, normalize=True)
+    assert isinstance(spatial_info5, float)
+    assert np.isclose(spatial_info5, expected)
+
+    # Check no firing returns zero information, and no occupancy returns NaN
+    assert compute_spatial_information(np.zeros(4), np.ones(4)) == 0.
+    assert np.isnan(compute_spatial_information(np.ones(4), np.zeros(4), normalize=True))
+    assert np.isnan(compute_spatial_information(np.ones(4), np.full(4, np.nan), normalize=True))
+
+def test_spatial_information_kernel():
+
+    occupancy = np.array([[1., 2., 0., 1.], [1., np.nan, 1., 1.]])
+    bin_counts = np.array([[1., 1., 0., 4.], [1., np.nan, 0., 3.]])
+
+    info = _spatial_information_kernel(bin_counts.ravel(), occupancy.ravel())
+    assert isinstance(info, float)
+    assert info > 0.
+
+    # Check that the kernel matches computing from normalized firing
+    bin_firing = normalize_bin_counts(bin_counts, occupancy)
+    rate = np.nansum(bin_counts) / np.nansum(occupancy)
+    occ_prob = occupancy / np.nansum(occupancy)
+    nz = (bin_firing > 0) & (occupancy > 0)
+    expected = np.nansum(occ_prob[nz] * bin_firing[nz] * np.log2(bin_firing[nz] / rate)) / rate
+    assert np.isclose(info, expected)
+
+    # Check no firing returns zero information, and no occupancy returns NaN
+    assert _spatial_information_kernel(np.zeros(4), np.ones(4)) == 0.
+    assert np.isnan(_spatial_information_kernel(np.ones(4), np.zeros(4)))
+
+@pytest.mark.skipif(not ne, reason='numexpr is not available')
+def test_compute_spatial_information_numexpr(monkeypatch):
+
+    monkeypatch.setattr(information, 'nb', False)
+
+    n_bins = PARALLEL_NBINS + 1
+    bin_counts = np.tile([0., 1., 4., 2., np.nan], n_bins // 5 + 1)[:n_bins]
+    occupancy = np.tile([1., 2., 1., 0., 1., np.nan], n_bins // 6 + 1)[:n_bins]
+
+    n_threads = ne.set_num_threads(4)
+    try:
+        info = compute_spatial_information(bin_counts, occupancy, normalize=True)
+    finally:
+        ne.set_num_threads(n_threads)
+
+    monkeypatch.setattr(information, 'ne', False)
+    expected = compute_spatial_information(bin_counts, occupancy, normalize=True)
+
+    assert isinstance(info, float)
+    assert np.isclose(info, expected)
+
+@pytest.mark.skipif(not nb, reason='numba is not available')
+def test_spatial_information_kernel_parallel():
+
+    from spiketools.spatial.information import _spatial_information_kernel_parallel
+
+    n_bins = PARALLEL_NBINS + 1
+    bin_counts = np.tile([0., 1., 4., 2., np.nan], n_bins // 5 + 1)[:n_bins]
+    occupancy = np.tile([1., 2., 1., 0., 1., np.nan], n_bins // 6 + 1)[:n_bins]
+
+    info = _spatial_information_kernel_parallel(bin_counts, occupancy)
+    assert isinstance(info, float)
+    assert np.isclose(info, _spatial_information_kernel(bin_counts, occupancy))
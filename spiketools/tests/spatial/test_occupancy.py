@@ -121,6 +121,10 @@ def test_compute_bin_counts_assgn():
     assert np.array_equal(bin_counts.shape, np.array([bins[1], bins[0]]))
     assert np.array_equal(bin_counts, np.array([[2, 0], [1, 0], [0, 1]]))
 
+    # check 2d case, with outlier bin assignments
+    bin_counts = compute_bin_counts_assgn(bins, [-1, 0, 0, 1, 2], [0, 0, 1, 2, 3])
+    assert np.array_equal(bin_counts, np.array([[1, 0], [1, 0], [0, 2]]))
+
 def test_normalize_bin_counts():
 
     # Test with full sampling of occupancy
@@ -55,6 +55,11 @@ def test_create_dataframe_bins():
     df = create_dataframe_bins(data3d, other_data)
     assert np.array_equal(df.trial.values, df.extra.values)
 
+    # Check column order, including with custom bin column labels
+    assert list(df.columns) == ['trial', 'xbin', 'ybin', 'extra', 'fr']
+    df = create_dataframe_bins(data2da, other_data, bin_columns=['position', 'rate'])
+    assert list(df.columns) == ['trial', 'position', 'extra', 'rate']
+
 def test_fit_anova(tdata2d):
 
     df = create_dataframe(tdata2d, ['out', 'pred'])
@@ -67,3 +72,23 @@ def test_fit_anova(tdata2d):
 
     model = fit_anova(df, 'out ~ pred', 'pred', return_type='model')
     assert model
+
+    # test repeated fits with the same predictors, which use the cached design matrix
+    data1 = np.array([[1, 2, 3, 7, 2], [4, 5, 6, 4, 1], [8, 9, 10, 9, 8]])
+    data2 = np.array([[2, 2, 1, 7, 3], [1, 5, 6, 3, 1], [9, 9, 8, 9, 7]])
+    f_val1 = fit_anova(create_dataframe_bins(data1), 'fr ~ C(bin)', 'C(bin)')
+    f_val2 = fit_anova(create_dataframe_bins(data2), 'fr ~ C(bin)', 'C(bin)')
+    assert len(DESIGN_CACHE) > 0
+    DESIGN_CACHE.clear()
+    assert f_val2 == fit_anova(create_dataframe_bins(data2), 'fr ~ C(bin)', 'C(bin)')
+    assert f_val1 != f_val2
+
+    # test repeated fits with the outcome in the predictor terms, which can not use the cache
+    rng = np.random.default_rng(0)
+    formula = 'fr ~ C(bin) + I(fr > 0.5)'
+    for ind in range(2):
+        df = create_dataframe_bins(rng.random((6, 4)))
+        results = fit_anova(df, formula, return_type='results', anova_type=1)
+        expected = sm.stats.anova_lm(smf.ols(formula, data=df).fit())
+        assert np.allclose(results.values, expected.values, equal_nan=True)
+    DESIGN_CACHE.clear()
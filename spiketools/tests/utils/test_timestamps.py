@@ -85,6 +85,11 @@ def test_convert_time_to_nsamples():
     assert isinstance(out, int)
     assert out == 12
 
+    times = np.array([0.024, 0.1])
+    out = convert_time_to_nsamples(times, fs)
+    assert isinstance(out, np.ndarray)
+    assert np.array_equal(out, np.array([12, 50]))
+
 def test_sum_time_ranges():
 
     range0 = []
@@ -122,6 +127,12 @@ def test_split_time_value():
     hours, minutes, seconds = split_time_value(value)
     assert (hours, minutes, seconds) == (1, 30, 30)
 
+    values = np.array([3600 + 1800 + 30, 7200 + 45])
+    hours, minutes, seconds = split_time_value(values)
+    assert np.array_equal(hours, np.array([1, 2]))
+    assert np.array_equal(minutes, np.array([30, 0]))
+    assert np.array_equal(seconds, np.array([30, 45]))
+
 def test_format_time_string():
 
     hours, minutes, seconds = 1.0, 30.0, 45.0
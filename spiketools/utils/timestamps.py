@@ -1,5 +1,7 @@
 """Utility functions for working with timestamps."""
 
+import math
+
 import numpy as np
 
 ###################################################################################################
@@ -206,14 +208,14 @@ def convert_time_to_nsamples(time, fs):
 
     Parameters
     ----------
-    time : float
-        Time duration.
+    time : float or 1d array
+        Time duration(s).
     fs : int
         Sampling rate.
 
     Returns
     -------
-    n_samples : int
+    n_samples : int or 1d array
         Number of samples.
 
     Examples
@@ -222,9 +224,17 @@ def convert_time_to_nsamples(time, fs):
 
     >>> convert_time_to_nsamples(0.005, fs=1000)
     5
+
+    Convert an array of time lengths to numbers of samples:
+
+    >>> convert_time_to_nsamples(np.array([0.005, 0.01]), fs=1000)
+    array([ 5, 10])
     """
 
-    n_samples = int(np.ceil(time * fs))
+    if np.ndim(time) == 0:
+        n_samples = math.ceil(time * fs)
+    else:
+        n_samples = np.ceil(np.asarray(time) * fs).astype(int)
 
     return n_samples
 
@@ -304,13 +314,13 @@ def split_time_value(sec):
 
     Parameters
     ----------
-    sec : float
-        Time value, in seconds.
+    sec : float or 1d array
+        Time value(s), in seconds.
 
     Returns
     -------
-    hours, minutes, seconds : float
-        Time value, split up into hours, minutes, and seconds.
+    hours, minutes, seconds : float or 1d array
+        Time value(s), split up into hours, minutes, and seconds.
 
     Examples
     --------
@@ -318,10 +328,17 @@ def split_time_value(sec):
 
     >>> split_time_value(15000)
     (4, 10, 0)
+
+    Split an array of time values into hours, minutes, and seconds:
+
+    >>> split_time_value(np.array([15000, 3690]))
+    (array([4, 1]), array([10,  1]), array([ 0, 30]))
     """
 
-    minutes, seconds = divmod(sec, 60)
-    hours, minutes = divmod(minutes, 60)
+    divmod_func = divmod if np.ndim(sec) == 0 else np.divmod
+
+    minutes, seconds = divmod_func(sec, 60)
+    hours, minutes = divmod_func(minutes, 60)
 
     return hours, minutes, seconds
 